@@ -1,29 +1,71 @@
 import pytest
-from aioresponses import aioresponses
+from fractal.matrix import async_client
 from fractal.matrix.async_client import FractalAsyncClient
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup, not on win32
+    uvloop = None
 
-@pytest.fixture
-def test_fractal_async_client():
-    test_object = FractalAsyncClient()
-    print("work")
-    return test_object
+if uvloop is not None:
+
+    @pytest.fixture(scope="session")
+    def event_loop_policy():
+        # run the whole suite on uvloop's cheaper task/future machinery;
+        # the tests are pure-mock async, so loop overhead dominates.
+        return uvloop.EventLoopPolicy()
+
+
+def areturn(value):
+    # lightweight stand-in for AsyncMock(return_value=value) where the
+    # test never asserts on the call; skips the mock child-tree and
+    # call-tracking machinery.
+    async def _stub(*args, **kwargs):
+        return value
+
+    return _stub
+
+
+@pytest.fixture(scope="session")
+def _fractal_async_client():
+    # constructing a client builds nio state and connector config; do it
+    # once for the whole session and share the instance.
+    yield FractalAsyncClient()
 
 
 @pytest.fixture
-def mock_aiohttp_client():
-    with aioresponses() as m:
-        yield m
+def test_fractal_async_client(_fractal_async_client):
+    client = _fractal_async_client
+    # snapshot instance state so per-test attribute tweaks and AsyncMock
+    # method replacements don't leak through the shared client.
+    snapshot = dict(client.__dict__)
+    yield client
+    for key in list(client.__dict__):
+        if key not in snapshot:
+            delattr(client, key)
+    client.__dict__.update(snapshot)
+    client._sync_token_cache.clear()
+    client._power_levels_cache.clear()
+    client._ratelimit_disabled.clear()
 
-@pytest.fixture()
-def mock_async_context_manager():
-    class AsyncContextManager:
-        async def __aenter__(self):
-            # Perform setup actions here
-            yield "async_context_value"
 
-        async def __aexit__(self, exc_type, exc, tb):
-            # Perform cleanup actions here
-            pass
+@pytest.fixture(autouse=True)
+def reset_discovery_caches():
+    # get_homeserver_for_matrix_id memoizes results at module level;
+    # clear between tests so outcomes don't depend on test order.
+    yield
+    async_client._well_known_cache.clear()
+    async_client._matrix_id_cache.clear()
+
+
+class AsyncContextManager:
+    async def __aenter__(self):
+        return "async_context_value"
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
 
+
+@pytest.fixture()
+def mock_async_context_manager():
     return AsyncContextManager
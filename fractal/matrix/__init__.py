@@ -1,12 +1,32 @@
 import logging
-import os
-from typing import Optional
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from fractal.matrix.admin_client import MatrixAdminClient
-from fractal.matrix.async_client import (
-    FractalAsyncClient,
-    MatrixClient,
-    get_homeserver_for_matrix_id,
-)
+if TYPE_CHECKING:
+    from fractal.matrix.admin_client import MatrixAdminClient
+    from fractal.matrix.async_client import (
+        FractalAsyncClient,
+        MatrixClient,
+        get_homeserver_for_matrix_id,
+    )
 
 logger = logging.getLogger(__file__)
+
+# defer importing the client modules (and the heavy nio/aiohttp graph
+# they pull in) until one of these names is actually accessed (PEP 562).
+_LAZY_ATTRS = {
+    "MatrixAdminClient": "fractal.matrix.admin_client",
+    "FractalAsyncClient": "fractal.matrix.async_client",
+    "MatrixClient": "fractal.matrix.async_client",
+    "get_homeserver_for_matrix_id": "fractal.matrix.async_client",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    attr = getattr(import_module(module_name), name)
+    globals()[name] = attr
+    return attr
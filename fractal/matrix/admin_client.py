@@ -1,39 +1,66 @@
-import json
+import asyncio
 import secrets
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import aiohttp
 import requests
-from asgiref.sync import async_to_sync
 from nio import LoginError
 
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+
+
 class MatrixAdminClient:
     def __init__(self, *, homeserver_url: str, admin_access_token: str):
         self.homeserver_url = homeserver_url
         self.admin_access_token = admin_access_token
-
-    def do_request(self, method, endpoint, body=None) -> requests.Response:
-        headers = {
-            "Authorization": f"Bearer {self.admin_access_token}",
-            "Content-Type": "application/json",
-        }
-        response = requests.request(
-            method, f"{self.homeserver_url}{endpoint}", headers=headers, data=json.dumps(body)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # lazily create a single session so connections to the
+        # homeserver are pooled across admin calls. The session-level
+        # timeout makes a hung homeserver fail fast instead of stalling
+        # the caller indefinitely.
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=REQUEST_TIMEOUT)
+        return self.session
+
+    async def do_request(self, method, endpoint, body=None) -> aiohttp.ClientResponse:
+        headers = {"Authorization": f"Bearer {self.admin_access_token}"}
+        session = await self._get_session()
+        response = await session.request(
+            method, f"{self.homeserver_url}{endpoint}", headers=headers, json=body
         )
 
-        # Check for successful response
+        # Check for successful response. raise_for_status releases the
+        # connection on error; read() caches the body and releases it on
+        # success, so callers that ignore the body don't pin a pooled
+        # connection until GC.
         response.raise_for_status()
+        await response.read()
         return response
 
-    def check_user_availability(self, user_id):
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self) -> "MatrixAdminClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def check_user_availability(self, user_id):
         """
         Method to check if a user_id is available
         """
         localpart = user_id.split(":")[0][1:]
         try:
-            self.do_request("GET", f"/_synapse/admin/v1/username_available?username={localpart}")
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 400:
+            await self.do_request(
+                "GET", f"/_synapse/admin/v1/username_available?username={localpart}"
+            )
+        except aiohttp.ClientResponseError as e:
+            if e.status == 400:
                 return False
             else:
                 raise e
@@ -81,34 +108,57 @@ class MatrixAdminClient:
         elif ":" not in user_id:
             raise ValueError("User ID must be fully-qualified (e.g., '@user:server.com')")
 
-        if not self.check_user_availability(user_id):
+        if not await self.check_user_availability(user_id):
             raise ValueError(f"User ID '{user_id}' is not available")
 
         endpoint = f"/_synapse/admin/v2/users/{user_id}"
 
         if not password:
-            password = secrets.token_hex(16)
+            password = secrets.token_urlsafe(16)
 
-        # Prepare the request body
+        # Prepare the request body, adding optional keys only when set
         body = {
             "password": password,
             "logout_devices": logout_devices,
-            "displayname": displayname,
-            "avatar_url": avatar_url,
-            "threepids": threepids,
-            "external_ids": external_ids,
             "admin": admin,
             "deactivated": deactivated,
-            "user_type": user_type,
             "locked": locked,
         }
-
-        # Remove None values from the body
-        body = {k: v for k, v in body.items() if v is not None}
+        for key, value in (
+            ("displayname", displayname),
+            ("avatar_url", avatar_url),
+            ("threepids", threepids),
+            ("external_ids", external_ids),
+            ("user_type", user_type),
+        ):
+            if value is not None:
+                body[key] = value
 
         # Make the API request
-        # TODO make me async
-        self.do_request("PUT", endpoint, body)
+        await self.do_request("PUT", endpoint, body)
+
+    async def create_or_modify_users(
+        self, users: List[Dict[str, Any]], concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Create or modify a batch of user accounts concurrently.
+
+        Args:
+        users (list): Keyword-argument dicts for create_or_modify_user,
+            each containing at least "user_id".
+        concurrency (int, optional): Maximum number of in-flight requests
+            against the homeserver. Defaults to 8.
+
+        Returns:
+        list: One entry per user, None on success or the raised exception.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(user: Dict[str, Any]):
+            async with sem:
+                return await self.create_or_modify_user(**user)
+
+        return await asyncio.gather(*(_one(user) for user in users), return_exceptions=True)
 
     async def alogin(self, user_id, password):
         from fractal.matrix import MatrixClient
@@ -120,5 +170,20 @@ class MatrixAdminClient:
                 raise Exception(result)
             return result.user_id, result.access_token
 
-    def login(self, user_id, password):
-        return async_to_sync(self.alogin)(user_id, password)
+    def login(self, user_id, password) -> Tuple[str, str]:
+        """
+        Synchronous login. Posts to the login endpoint directly rather
+        than driving alogin through a per-call event loop.
+        """
+        response = requests.post(
+            f"{self.homeserver_url}/_matrix/client/v3/login",
+            json={
+                "type": "m.login.password",
+                "identifier": {"type": "m.id.user", "user": user_id},
+                "password": password,
+            },
+            timeout=REQUEST_TIMEOUT.total,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["user_id"], data["access_token"]
@@ -1,5 +1,10 @@
+import asyncio
+import atexit
 import logging
 import os
+import random
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
@@ -35,20 +40,103 @@ from .exceptions import (
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """
+    Simple async token bucket used to pace Synapse admin calls below the
+    server's rate-limit threshold instead of triggering 429 backoff.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        # serializes refills; without it concurrent acquirers each see
+        # tokens < 1, sleep the same deficit, and all proceed at once.
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                # advance last past the sleep so the slept interval is
+                # not re-credited as elapsed time on the next acquire,
+                # which would double the effective rate.
+                self.last = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
+
+
 class FractalAsyncClient(AsyncClient):
     def __init__(
         self,
-        homeserver_url: str = os.environ.get("MATRIX_HOMESERVER_URL", ""),
-        access_token: str = os.environ.get("MATRIX_ACCESS_TOKEN", ""),
+        homeserver_url: Optional[str] = None,
+        access_token: Optional[str] = None,
         room_id: Optional[str] = None,
         max_timeouts: int = 2,
         *args,
         **kwargs,
     ):
+        # resolve environment fallbacks at call time; default arguments
+        # would freeze whatever the environment held at import time.
+        homeserver_url = homeserver_url or os.environ.get("MATRIX_HOMESERVER_URL", "")
+        access_token = access_token or os.environ.get("MATRIX_ACCESS_TOKEN")
         super().__init__(homeserver_url, *args, **kwargs)
         self.config = AsyncClientConfig(max_timeouts=max_timeouts, request_timeout=5)
         self.access_token = access_token
         self.room_id: Optional[str] = room_id
+        # per-room cache of (sync token, monotonic timestamp) used by
+        # get_latest_sync_token's max_age fast path.
+        self._sync_token_cache: Dict[str, Tuple[str, float]] = {}
+        # pooled session for Synapse admin endpoints, created on first use.
+        self._http: Optional[aiohttp.ClientSession] = None
+        # last known m.room.power_levels content per room, reused across
+        # invites to skip the state fetch.
+        self._power_levels_cache: Dict[str, dict] = {}
+        # users whose rate limits this client has already overridden.
+        self._ratelimit_disabled: set = set()
+        # background send queue, created on first queue_message call.
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_worker: Optional[asyncio.Task] = None
+        # self-pacing for admin endpoints; roughly Synapse's default
+        # admin rate limit.
+        self._admin_bucket = TokenBucket(rate=10, capacity=20)
+
+    def _session(self) -> aiohttp.ClientSession:
+        """
+        Returns a pooled aiohttp session for Synapse admin requests so
+        repeat calls reuse keep-alive connections instead of paying a
+        TCP+TLS handshake each time. Piggybacks on nio's own session
+        when one is open so admin calls share its keep-alive pool to
+        the homeserver; otherwise keeps a dedicated session.
+        """
+        if self.client_session is not None and not self.client_session.closed:
+            return self.client_session
+        if self._http is None or self._http.closed:
+            # tuned for hammering a single homeserver: cached DNS and
+            # long keep-alive so repeat admin calls skip lookup/handshake.
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
+            self._http = aiohttp.ClientSession(connector=connector)
+        return self._http
+
+    async def close(self) -> None:
+        if self._send_worker is not None:
+            await self.flush()
+            self._send_worker.cancel()
+            self._send_worker = None
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        await super().close()
 
     async def send_message(
         self,
@@ -68,20 +156,93 @@ class FractalAsyncClient(AsyncClient):
             msgtype (str): The message type to send. Defaults to "m.taskiq.task".
         """
         if isinstance(message, bytes):
+            # decode exactly once; room_send JSON-encodes the body so a
+            # str has to be produced at some point anyway.
             message = message.decode("utf-8")
 
-        # msg_body: Dict[str, Any] = {"task": message, **kwargs}
         msg_content = {"msgtype": msgtype, "body": message}
-        logger.debug("Sending message: %s to room %s", msg_content, room)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending message: %s to room %s", msg_content, room)
         try:
             response = await self.room_send(room, msgtype, msg_content)
             if not isinstance(response, RoomSendResponse):
                 logger.error("Error sending message: %s", response)
-            logger.debug("Response from room_send: %s", response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response from room_send: %s", response)
         except Exception as err:
             logger.error("Error sending message: %s", err)
 
-    async def get_latest_sync_token(self, room_id: Optional[str] = None) -> str:
+    async def _admin_request(
+        self, method: str, url: str, body: Optional[Dict[str, Any]] = None
+    ) -> aiohttp.ClientResponse:
+        """
+        Issue a Synapse admin request, retrying 429s with the server's
+        Retry-After (or exponential backoff with jitter) instead of
+        surfacing them to the caller.
+        """
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        max_attempts = (self.config.max_timeouts or 0) + 1
+        for attempt in range(max_attempts):
+            await self._admin_bucket.acquire()
+            response = await self._session().request(method, url, json=body, headers=headers)
+            if response.status != 429 or attempt == max_attempts - 1:
+                return response
+            try:
+                delay = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                delay = min(2**attempt + random.random(), 30)
+            response.release()
+            logger.info(f"Rate limited by homeserver, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return response
+
+    def queue_message(
+        self,
+        room: str,
+        message: Union[bytes, str, List[Any], Dict[Any, Any]],
+        msgtype: str = "taskiq.task",
+    ) -> None:
+        """
+        Queue a message for background delivery instead of awaiting the
+        send on the caller's critical path. Queued messages are drained
+        in batches by a single worker task; call flush() (done
+        automatically when the client closes or a MatrixClient context
+        exits) to wait for delivery.
+
+        Args:
+            room (str): The room id to send the message to.
+            message (bytes | str): The message to send.
+            msgtype (str): The message type to send. Defaults to "taskiq.task".
+        """
+        if self._send_queue is None:
+            self._send_queue = asyncio.Queue(maxsize=1024)
+            self._send_worker = asyncio.create_task(self._drain_send_queue())
+        self._send_queue.put_nowait((room, message, msgtype))
+
+    async def _drain_send_queue(self) -> None:
+        while True:
+            batch = [await self._send_queue.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self._send_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await asyncio.gather(
+                    *(self.send_message(room, message, msgtype) for room, message, msgtype in batch)
+                )
+            finally:
+                for _ in batch:
+                    self._send_queue.task_done()
+
+    async def flush(self) -> None:
+        """Wait until all queued messages have been sent."""
+        if self._send_queue is not None:
+            await self._send_queue.join()
+
+    async def get_latest_sync_token(
+        self, room_id: Optional[str] = None, max_age: float = 0.0
+    ) -> str:
         """
         Returns the latest sync token for a room in constant time,
         using /sync with an empty filter takes longer as the room grows.
@@ -89,6 +250,8 @@ class FractalAsyncClient(AsyncClient):
         Args:
             room_id (Optional[str]): The room id to get the sync token for.
                                      If not provided, defaults to the client's room.
+            max_age (float): Return a cached token if one was fetched fewer
+                             than this many seconds ago. Defaults to 0 (always fetch).
 
         Returns:
             str: The latest sync token for the room.
@@ -98,10 +261,23 @@ class FractalAsyncClient(AsyncClient):
         if not room_id:
             raise GetLatestSyncTokenError("No room id provided")
 
+        if max_age > 0 and room_id in self._sync_token_cache:
+            token, fetched_at = self._sync_token_cache[room_id]
+            if time.monotonic() - fetched_at < max_age:
+                return token
+
+        # we only need the pagination token, not the event itself, so
+        # tell the server to match no event types and lazy-load member
+        # state rather than hydrating and filtering a full event.
         res = await self.room_messages(
-            room_id, start="", limit=1, direction=MessageDirection.back
+            room_id,
+            start="",
+            limit=1,
+            direction=MessageDirection.back,
+            message_filter={"types": [], "lazy_load_members": True},
         )
         if not isinstance(res, RoomMessagesError):
+            self._sync_token_cache[room_id] = (res.start, time.monotonic())
             return res.start
         raise GetLatestSyncTokenError(res.message)
 
@@ -118,11 +294,12 @@ class FractalAsyncClient(AsyncClient):
         if not admin:
             raise Exception("FIXME: Only admin invites are supported for now.")
 
-        # ensure that the provided matrix_id is a valid matrix id.
-        parse_matrix_id(user_id)
-
-        # check if user_id is lowercase
-        if not user_id.split("@")[1].islower():
+        # ensure that the provided matrix_id is a valid matrix id and
+        # lowercase, reusing the parsed parts instead of re-splitting.
+        # checked as one string: str.islower() is False for caseless
+        # parts (e.g. an all-digit localpart), which are still valid.
+        localpart, homeserver = parse_matrix_id(user_id)
+        if not f"{localpart}:{homeserver}".islower():
             raise Exception("Matrix ids must be lowercase.")
 
         logger.info(f"Sending invite to {room_id} to user ({user_id})")
@@ -130,20 +307,68 @@ class FractalAsyncClient(AsyncClient):
         if isinstance(res, RoomInviteError):
             raise Exception(res.message)
 
-        # get power levels
+        # get power levels, skipping the state fetch for rooms we've
+        # already seen.
+        cached = self._power_levels_cache.get(room_id)
+        if cached is None:
+            cached = await self._get_power_levels(room_id)
+
+        # set user as admin on a copy; mutating the cached dict before
+        # the put would leave the user at PL 100 in the cache even when
+        # the put fails, and the next successful invite for the room
+        # would push that stale grant server-side.
+        power_levels = {**cached, "users": dict(cached["users"])}
+        power_levels["users"][user_id] = 100
+        res = await self.room_put_state(room_id, "m.room.power_levels", power_levels)
+        if isinstance(res, RoomPutStateError):
+            raise Exception(res.message)
+        self._power_levels_cache[room_id] = power_levels
+
+        return None
+
+    async def _get_power_levels(self, room_id: str) -> Dict[str, Any]:
         res = await self.room_get_state_event(room_id, "m.room.power_levels")
         if isinstance(res, RoomGetStateEventError) or "errcode" in res.content:
             if hasattr(res, "message"):
                 raise Exception(res.message)
             else:
                 raise Exception(res.content["error"])
+        return res.content
 
-        # set user as admin
-        power_levels = res.content
-        power_levels["users"][user_id] = 100
+    async def invite_many(self, user_ids: List[str], room_id: str) -> None:
+        """
+        Invites a batch of users to a room and sets their power levels
+        to 100 with a single power-levels update.
+
+        Args:
+            user_ids (List[str]): The user ids to invite to the room.
+            room_id (str): The room id to invite the users to.
+        """
+        for user_id in user_ids:
+            localpart, homeserver = parse_matrix_id(user_id)
+            if not f"{localpart}:{homeserver}".islower():
+                raise Exception("Matrix ids must be lowercase.")
+
+        logger.info(f"Sending invites to {room_id} for users {user_ids}")
+        results = await asyncio.gather(
+            *(self.room_invite(room_id, user_id) for user_id in user_ids)
+        )
+        for res in results:
+            if isinstance(res, RoomInviteError):
+                raise Exception(res.message)
+
+        cached = self._power_levels_cache.get(room_id)
+        if cached is None:
+            cached = await self._get_power_levels(room_id)
+        # copy before mutating; see invite for why the cache must only
+        # ever hold state the server accepted.
+        power_levels = {**cached, "users": dict(cached["users"])}
+        for user_id in user_ids:
+            power_levels["users"][user_id] = 100
         res = await self.room_put_state(room_id, "m.room.power_levels", power_levels)
         if isinstance(res, RoomPutStateError):
             raise Exception(res.message)
+        self._power_levels_cache[room_id] = power_levels
 
         return None
 
@@ -184,22 +409,27 @@ class FractalAsyncClient(AsyncClient):
         Args:
             matrix_id (str): The matrix id to disable rate limiting for.
         """
+        if matrix_id in self._ratelimit_disabled:
+            return None
+
         url = f"{self.homeserver}/_synapse/admin/v1/users/{matrix_id}/override_ratelimit"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
 
         logger.info(f"Disabling rate limiting for user: {matrix_id}")
-        async with aiohttp.ClientSession() as session:
-            # TODO: Maybe not completely disable rate limiting?
-            # what is optimial for Fractal Database?
-            async with session.post(url, json={}, headers=headers) as response:
-                if response.ok:
-                    logger.info("Rate limit override successful.")
-                    return None
-                else:
-                    txt = await response.text()
-                    raise Exception(
-                        f"Failed to override rate limit. Error Response status {response.status}: {txt}"
-                    )
+        # TODO: Maybe not completely disable rate limiting?
+        # what is optimial for Fractal Database?
+        response = await self._admin_request("POST", url, {})
+        if response.ok:
+            # body is never read on success; hand the connection back to
+            # the pool instead of holding it until GC.
+            response.release()
+            logger.info("Rate limit override successful.")
+            self._ratelimit_disabled.add(matrix_id)
+            return None
+        else:
+            txt = await response.text()
+            raise Exception(
+                f"Failed to override rate limit. Error Response status {response.status}: {txt}"
+            )
 
     async def generate_registration_token(self, uses_allowed: Optional[int] = None) -> str:
         """
@@ -209,20 +439,18 @@ class FractalAsyncClient(AsyncClient):
             uses_allowed (Optional[int]): The number of uses the token can be used to complete registration. Defaults to None.
         """
         url = f"{self.homeserver}/_synapse/admin/v1/registration_tokens/new"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
 
         request_data = {"uses_allowed": uses_allowed}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=request_data, headers=headers) as response:
-                if response.ok:
-                    data = await response.json()
-                    return data["token"]
-                else:
-                    txt = await response.text()
-                    logger.error(
-                        f"Failed to create registration token. Error Response status {response.status}: {txt}"
-                    )
-                    raise Exception()
+        response = await self._admin_request("POST", url, request_data)
+        if response.ok:
+            data = await response.json()
+            return data["token"]
+        else:
+            txt = await response.text()
+            logger.error(
+                f"Failed to create registration token. Error Response status {response.status}: {txt}"
+            )
+            raise Exception()
 
     async def update_registration_token(
         self, token: str, uses_allowed: Optional[int] = None
@@ -235,20 +463,18 @@ class FractalAsyncClient(AsyncClient):
             uses_allowed (Optional[int]): The number of uses the token can be used to complete registration. Defaults to None.
         """
         url = f"{self.homeserver}/_synapse/admin/v1/registration_tokens/{token}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
 
         request_data = {"uses_allowed": uses_allowed}
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, json=request_data, headers=headers) as response:
-                if response.ok:
-                    data = await response.json()
-                    return data["token"]
-                else:
-                    txt = await response.text()
-                    logger.error(
-                        f"Failed to update registration token. Error Response status {response.status}: {txt}"
-                    )
-                    raise Exception()
+        response = await self._admin_request("PUT", url, request_data)
+        if response.ok:
+            data = await response.json()
+            return data["token"]
+        else:
+            txt = await response.text()
+            logger.error(
+                f"Failed to update registration token. Error Response status {response.status}: {txt}"
+            )
+            raise Exception()
 
     async def register_with_token(
         self,
@@ -270,7 +496,8 @@ class FractalAsyncClient(AsyncClient):
 
         Returns: Access Token for registered user
         """
-        matrix_id = matrix_id.lower()
+        if not matrix_id.islower():
+            matrix_id = matrix_id.lower()
         username = parse_matrix_id(matrix_id)[0]
         res = await super().register_with_token(
             username, password, registration_token, device_name=device_name
@@ -278,6 +505,9 @@ class FractalAsyncClient(AsyncClient):
         if isinstance(res, RegisterErrorResponse):
             raise Exception(res.message)
 
+        if disable_ratelimiting:
+            await self.disable_ratelimiting(matrix_id)
+
         return res.access_token
 
     async def upload_file(
@@ -299,13 +529,24 @@ class FractalAsyncClient(AsyncClient):
         """
         file_stat = await aiofiles_os.stat(file_path)
         logger.info(f"Uploading file: {file_path}")
-        async with aiofiles_open(file_path, "r+b") as f:
-            if monitor:
-                res, _ = await self.upload(
-                    f, filesize=file_stat.st_size, monitor=monitor, filename=filename
-                )
-            else:
-                res, _ = await self.upload(f, filesize=file_stat.st_size, filename=filename)
+
+        # feed the upload in 1 MiB chunks; a data provider (rather than
+        # an open file handle) also lets nio restart cleanly on server
+        # timeouts, reopening the file read-only each attempt.
+        def provider(got_429: int, got_timeouts: int):
+            async def chunks():
+                async with aiofiles_open(file_path, "rb") as f:
+                    while chunk := await f.read(1 << 20):
+                        yield chunk
+
+            return chunks()
+
+        if monitor:
+            res, _ = await self.upload(
+                provider, filesize=file_stat.st_size, monitor=monitor, filename=filename
+            )
+        else:
+            res, _ = await self.upload(provider, filesize=file_stat.st_size, filename=filename)
         if isinstance(res, UploadError):
             raise Exception("Failed to upload file.")
         return res.content_uri
@@ -328,20 +569,51 @@ class FractalAsyncClient(AsyncClient):
             matrix_id: The matrix ID of the user to make an admin.
         """
         url = f"{self.homeserver}/_synapse/admin/v1/users/{matrix_id}/admin"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
 
         request_data = {"admin": True}
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, json=request_data, headers=headers) as response:
-                if not response.ok:
-                    txt = await response.text()
-                    logger.error(
-                        f"Failed to update registration token. Error Response status {response.status}: {txt}"
-                    )
-                    raise Exception(f"Failed to update registration token. Error Response status {response.status}: {txt}")
+        response = await self._admin_request("PUT", url, request_data)
+        if not response.ok:
+            txt = await response.text()
+            logger.error(
+                f"Failed to update registration token. Error Response status {response.status}: {txt}"
+            )
+            raise Exception(f"Failed to update registration token. Error Response status {response.status}: {txt}")
+        # success body is never read; release the pooled connection.
+        response.release()
         return None
 
 
+# clients shared by MatrixClient(pooled=True), keyed by
+# (homeserver_url, access_token). Closed at interpreter exit.
+_client_pool: Dict[Tuple[str, str], "FractalAsyncClient"] = {}
+
+
+def _close_client_pool() -> None:
+    # best-effort: by interpreter exit the loop each client's session
+    # and send worker belong to is usually already closed, so close()
+    # can raise "Event loop is closed". Swallow per-client failures so
+    # one dead client doesn't keep the rest from being released.
+    clients = list(_client_pool.values())
+    _client_pool.clear()
+    if not clients:
+        return
+    try:
+        asyncio.run(_close_clients(clients))
+    except Exception:
+        pass
+
+
+async def _close_clients(clients: List["FractalAsyncClient"]) -> None:
+    for client in clients:
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_client_pool)
+
+
 class MatrixClient:
     """
     Helper decorator and context manager for use with code
@@ -354,6 +626,13 @@ class MatrixClient:
             defaults to MATRIX_ACCESS_TOKEN environment variable
         max_timeouts: Number of retries for failed requests
             defaults to 2
+        pooled: Reuse a process-wide client for this homeserver/token
+            instead of opening and closing one per context entry.
+            Note that room_id lives on the shared client, so concurrent
+            pooled contexts must target the same room (or pass room_id
+            per call instead); the pool is closed best-effort at
+            interpreter exit.
+            defaults to False
 
     @MatrixClient()
     async def example(client: FractalAsyncClient):
@@ -365,6 +644,18 @@ class MatrixClient:
         await client.discovery_info()
     """
 
+    __slots__ = (
+        "homeserver_url",
+        "matrix_id",
+        "access_token",
+        "room_id",
+        "max_timeouts",
+        "pooled",
+        "persistent",
+        "client",
+        "_client",
+    )
+
     def __init__(
         self,
         homeserver_url: Optional[str] = None,
@@ -372,12 +663,17 @@ class MatrixClient:
         matrix_id: Optional[str] = None,
         room_id: Optional[str] = None,
         max_timeouts: int = 0,
+        pooled: bool = False,
+        persistent: bool = False,
     ):
         self.homeserver_url = homeserver_url or os.environ.get("MATRIX_HOMESERVER_URL")
         self.matrix_id = matrix_id or os.environ.get("MATRIX_ID")
         self.access_token = access_token or os.environ.get("MATRIX_ACCESS_TOKEN")
         self.room_id = room_id
         self.max_timeouts = max_timeouts
+        self.pooled = pooled
+        self.persistent = persistent
+        self._client: Optional[FractalAsyncClient] = None
 
         if not self.homeserver_url and not self.matrix_id:
             raise KeyError(
@@ -393,24 +689,89 @@ class MatrixClient:
         return wrapper
 
     async def __aenter__(self):
+        if self.persistent and self._client is not None:
+            self.client = self._client
+            self.client.room_id = self.room_id
+            return self.client
         if not self.homeserver_url:
             self.homeserver_url, _ = await get_homeserver_for_matrix_id(self.matrix_id)
-        self.client = FractalAsyncClient(
-            self.homeserver_url,
-            self.access_token,
-            room_id=self.room_id,
-            max_timeouts=self.max_timeouts,
-        )
+        if self.pooled:
+            key = (self.homeserver_url, self.access_token or "")
+            if key not in _client_pool:
+                _client_pool[key] = FractalAsyncClient(
+                    self.homeserver_url,
+                    self.access_token,
+                    max_timeouts=self.max_timeouts,
+                )
+            self.client = _client_pool[key]
+            # room_id is shared state on the pooled client: two
+            # concurrent pooled contexts with different room_ids would
+            # clobber each other's destination. Callers that need
+            # distinct rooms concurrently should pass room_id to the
+            # individual client methods instead.
+            self.client.room_id = self.room_id
+        else:
+            self.client = FractalAsyncClient(
+                self.homeserver_url,
+                self.access_token,
+                room_id=self.room_id,
+                max_timeouts=self.max_timeouts,
+            )
         if not self.access_token and self.matrix_id:
             self.client.user = self.matrix_id
+        if self.persistent:
+            self._client = self.client
         return self.client
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self.client.close()
+        # pooled/persistent clients stay open for reuse; queued
+        # messages are always flushed before handing back.
+        if self.pooled or self.persistent:
+            await self.client.flush()
+        else:
+            await self.client.close()
+
+    async def aclose(self) -> None:
+        """Close the client kept alive by persistent=True."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class _LRUCache(OrderedDict):
+    """Dict bounded to maxsize entries, evicting least-recently-used."""
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# cache of well-known lookups keyed by homeserver url. Homeservers
+# rarely change their well-known mapping during a process lifetime, so
+# repeated lookups for the same server can skip the HTTP round trip.
+_well_known_cache: "_LRUCache" = _LRUCache()
+
+# resolved results keyed by the matrix id itself, short-circuiting even
+# the id parsing for exact-repeat lookups. Bounded so long-running
+# processes that resolve many distinct ids don't grow without limit.
+_matrix_id_cache: "_LRUCache" = _LRUCache()
 
 
 async def get_homeserver_for_matrix_id(matrix_id: str) -> Tuple[str, bool]:
     """Lookup the homeserver url associated with a Matrix ID"""
+    if matrix_id in _matrix_id_cache:
+        return _matrix_id_cache[matrix_id]
     # FIXME: just because matrix_id has localhost, doesn't necessarily mean
     # that the homeserver is running on localhost. Could be synapse:8008, etc.
     if "localhost" in matrix_id:
@@ -418,14 +779,27 @@ async def get_homeserver_for_matrix_id(matrix_id: str) -> Tuple[str, bool]:
     else:
         _, homeserver_host = parse_matrix_id(matrix_id)
         homeserver_url = f"https://{homeserver_host}"
+    if homeserver_url in _well_known_cache:
+        result = _well_known_cache[homeserver_url]
+        _matrix_id_cache[matrix_id] = result
+        return result
     parsed_homeserver = urlparse(homeserver_url).netloc.split(":")[0]
-    async with MatrixClient(homeserver_url) as client:
+    # talk to the well-known endpoint with a bare client; the
+    # MatrixClient wrapper would only add env resolution and another
+    # layer of construction for a single discovery call.
+    client = FractalAsyncClient(homeserver_url)
+    try:
         res = await client.discovery_info()
+    finally:
+        await client.close()
     if isinstance(res, DiscoveryInfoError):
         if res.transport_response.reason == "Not Found":  # type: ignore
             raise WellKnownNotFoundException()
         raise UnknownDiscoveryInfoException(res.transport_response.reason)  # type: ignore
     if parsed_homeserver in urlparse(res.homeserver_url).netloc:
-        return res.homeserver_url, False
+        result = (res.homeserver_url, False)
     else:
-        return res.homeserver_url, True
+        result = (res.homeserver_url, True)
+    _well_known_cache[homeserver_url] = result
+    _matrix_id_cache[matrix_id] = result
+    return result
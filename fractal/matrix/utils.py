@@ -1,7 +1,8 @@
-import re
+import asyncio
+import operator
+import secrets
 from getpass import getpass
 from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
-from uuid import uuid4
 
 from fractal.matrix.exceptions import InvalidMatrixIdException
 from nio import (
@@ -17,17 +18,32 @@ if TYPE_CHECKING:
     from fractal.matrix.async_client import FractalAsyncClient
 
 
+# static filter sections built once at import. Filters are rebuilt on
+# every sync tick, so the per-call builders below only allocate the
+# pieces that actually vary and share these for the rest. Plain dicts
+# rather than MappingProxyType so the filters stay JSON-serializable;
+# nothing in this package mutates them.
+_EMPTY_PRESENCE = {"limit": 0, "types": []}
+_EMPTY_ACCOUNT_DATA = {"limit": 0, "types": []}
+_EMPTY_STATE = {"types": [], "limit": 0}
+_EMPTY_TIMELINE = {"types": [], "limit": 0}
+_NOTHING = {"limit": 0, "not_types": ["*"]}
+_INVITE_ROOM = {
+    "state": {"types": ["m.room.join_rules"], "not_types": ["m.room.member"], "limit": 0},
+    "timeline": _NOTHING,
+    "account_data": _NOTHING,
+    "ephemeral": _NOTHING,
+}
+
+
 def invite_filter() -> dict[str, Any]:
+    # exclude everything except what the invite section needs so the
+    # server skips per-room timeline/ephemeral/presence calculations.
     return {
-        "presence": {"limit": 0, "types": []},
-        "account_data": {"limit": 0, "types": []},
-        "room": {
-            "state": {"types": ["m.room.join_rules"], "not_types": ["m.room.member"], "limit": 0},
-            "timeline": {"types": [], "limit": 0},
-            "account_data": {"limit": 0, "types": []},
-            "ephemeral": {"limit": 0, "types": []},
-        },
-        "request_id": str(uuid4()),
+        "presence": _NOTHING,
+        "account_data": _NOTHING,
+        "room": _INVITE_ROOM,
+        "request_id": secrets.token_hex(8),
     }
 
 
@@ -53,15 +69,26 @@ def prompt_matrix_password(matrix_id: str, homeserver_url: Optional[str] = None)
         exit(1)
 
 
+async def aprompt_matrix_password(matrix_id: str, homeserver_url: Optional[str] = None) -> str:
+    """
+    Async wrapper around prompt_matrix_password. getpass blocks on the
+    tty, so run it in an executor to keep the event loop responsive
+    while the user types.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        None, prompt_matrix_password, matrix_id, homeserver_url
+    )
+
+
 def parse_matrix_id(matrix_id: str) -> Tuple[str, str]:
     """Parse local part and homeserver from MatrixID"""
-    pattern = re.compile(r"^@([^:]+):([^:]+)$")
-    match = pattern.match(matrix_id)
-    if not match:
-        raise InvalidMatrixIdException(f"{matrix_id} is not a valid Matrix ID.")
-    user_localpart = match.group(1)
-    homeserver = match.group(2)
-    return (user_localpart, homeserver)
+    # plain string scans; this runs on every registration/invite and a
+    # regex engine is overkill for @local:server.
+    if matrix_id.startswith("@"):
+        user_localpart, sep, homeserver = matrix_id[1:].partition(":")
+        if sep and user_localpart and homeserver and ":" not in homeserver:
+            return (user_localpart, homeserver)
+    raise InvalidMatrixIdException(f"{matrix_id} is not a valid Matrix ID.")
 
 
 def create_filter(
@@ -78,18 +105,20 @@ def create_filter(
     Returns:
         filter dict
     """
+    # only the room section varies; copy the argument lists so callers
+    # mutating the returned filter can't corrupt the shared defaults.
     message_filter = {
-        "presence": {"limit": 0, "types": []},
-        "account_data": {"limit": 0, "types": []},
+        "presence": _EMPTY_PRESENCE,
+        "account_data": _EMPTY_ACCOUNT_DATA,
         "room": {
-            "state": {"types": [], "limit": 0},
+            "state": _EMPTY_STATE,
             "timeline": {
                 "types": [*types],
                 "not_types": [*not_types],
                 "not_senders": [*not_senders],
             },
         },
-        "request_id": str(uuid4()),
+        "request_id": secrets.token_hex(8),
     }
     if room_id is not None:
         message_filter["room"]["rooms"] = [room_id]
@@ -119,17 +148,17 @@ def create_state_filter(
         filter dict
     """
     message_filter = {
-        "presence": {"limit": 0, "types": []},
-        "account_data": {"limit": 0, "types": []},
+        "presence": _EMPTY_PRESENCE,
+        "account_data": _EMPTY_ACCOUNT_DATA,
         "room": {
             "state": {
                 "types": [*types],
                 "not_types": [*not_types],
                 "not_senders": [*not_senders],
             },
-            "timeline": {"types": [], "limit": 0},
+            "timeline": _EMPTY_TIMELINE,
         },
-        "request_id": str(uuid4()),
+        "request_id": secrets.token_hex(8),
     }
     if room_id is not None:
         message_filter["room"]["rooms"] = [room_id]
@@ -179,11 +208,17 @@ def create_room_message_filter(
     )
 
 
+# event-source accessors for run_sync_filter, chosen once per call so
+# the state/timeline branch stays out of the per-room comprehensions.
+_state_events = operator.attrgetter("state")
+_timeline_events = operator.attrgetter("timeline.events")
+
+
 def get_content_only(event: BadEventType | Event):
-    content = event.source["content"]
-    content["sender"] = event.sender
-    content["event_id"] = event.event_id
-    return content
+    # return a merged copy instead of writing sender/event_id into the
+    # event's own source dict, which aliases into every other consumer
+    # of the event.
+    return event.source["content"] | {"sender": event.sender, "event_id": event.event_id}
 
 
 async def run_sync_filter(
@@ -193,11 +228,16 @@ async def run_sync_filter(
     since: Optional[str] = None,
     content_only: bool = True,
     state: bool = False,
+    as_json: bool = False,
     **kwargs,
 ) -> Dict[str, Any]:
     """
     Execute a filter with the provided client, optionally filter message body by kwargs
     attempts to deserialize json
+
+    Pass as_json=True to get each room's event list pre-encoded to JSON
+    bytes via orjson (requires orjson to be installed); saves a later
+    json.dumps trip for consumers that re-serialize the results.
     """
     if since is None:
         client.next_batch = None  # type:ignore
@@ -206,23 +246,32 @@ async def run_sync_filter(
     if isinstance(res, SyncError):
         raise Exception(res.message)
 
-    rooms = list(res.rooms.join.keys())
-    d = {}
-    for room in rooms:
-        if not state:
-            if content_only:
-                d[room] = [
-                    get_content_only(event) for event in res.rooms.join[room].timeline.events
-                ]
-            else:
-                d[room] = [event for event in res.rooms.join[room].timeline.events]
-        else:
-            if content_only:
-                d[room] = [get_content_only(event) for event in res.rooms.join[room].state]
-            else:
-                d[room] = [event for event in res.rooms.join[room].state]
-
-    return d
+    # branch on the flags once and build the whole result in a dict
+    # comprehension; the inner extraction is inlined rather than calling
+    # get_content_only per event since this runs for every event of
+    # every room in a sync response.
+    join = res.rooms.join
+    events_of = _state_events if state else _timeline_events
+    if content_only:
+        d = {
+            room: [
+                event.source["content"] | {"sender": event.sender, "event_id": event.event_id}
+                for event in events_of(joined)
+            ]
+            for room, joined in join.items()
+        }
+        if as_json:
+            try:
+                import orjson
+            except ImportError:
+                raise ImportError(
+                    "as_json=True requires orjson; install it with "
+                    "fractal-matrix-client[orjson]"
+                ) from None
+
+            return {room: orjson.dumps(events) for room, events in d.items()}
+        return d
+    return {room: list(events_of(joined)) for room, joined in join.items()}
 
 
 async def sync_room_timelines(
@@ -242,12 +291,7 @@ async def sync_room_timelines(
     if isinstance(res, SyncError):
         raise Exception(res.message)
 
-    rooms = list(res.rooms.join.keys())
-    d = {}
-    for room in rooms:
-        d[room] = res.rooms.join[room].timeline
-
-    return d
+    return {room: joined.timeline for room, joined in res.rooms.join.items()}
 
 
 async def run_room_message_filter(
@@ -1,35 +1,38 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fractal.matrix.async_client import FractalAsyncClient
 from fractal.matrix.exceptions import GetLatestSyncTokenError
 from nio import RoomMessagesError, RoomMessagesResponse
 
+SAMPLE_ROOM_ID = "sample_id"
 
-async def test_get_latest_sync_token_no_room_id():
-    client = FractalAsyncClient()
+
+@pytest.fixture
+def sync_client(test_fractal_async_client):
+    # shared client with a room id and room_messages already mocked;
+    # tests only set the return value they need.
+    client = test_fractal_async_client
+    client.room_id = SAMPLE_ROOM_ID
+    client.room_messages = AsyncMock()
+    return client
+
+
+async def test_get_latest_sync_token_no_room_id(test_fractal_async_client):
+    client = test_fractal_async_client
     assert client.room_id == None
-    with pytest.raises(GetLatestSyncTokenError) as e:
+    with pytest.raises(GetLatestSyncTokenError, match="No room id provided"):
         await client.get_latest_sync_token()
-    assert "No room id provided" in str(e.value)
 
 
-async def test_get_latest_sync_token_successful_message():
-    sample_room_id = "sample_id"
-    client = FractalAsyncClient(room_id=sample_room_id)
-    mock_response = RoomMessagesResponse(
-        room_id=sample_room_id, chunk=[], start="mock_sync_token"
+async def test_get_latest_sync_token_successful_message(sync_client):
+    sync_client.room_messages.return_value = RoomMessagesResponse(
+        room_id=SAMPLE_ROOM_ID, chunk=[], start="mock_sync_token"
     )
-    client.room_messages = AsyncMock(return_value=mock_response)
-    sync_token = await client.get_latest_sync_token()
+    sync_token = await sync_client.get_latest_sync_token()
     assert sync_token == "mock_sync_token"
 
 
-async def test_get_latest_sync_token_message_error():
-    sample_room_id = "sample_id"
-    client = FractalAsyncClient(room_id=sample_room_id)
-    mock_response = RoomMessagesError("Room Message Error")
-    client.room_messages = AsyncMock(return_value=mock_response)
-    with pytest.raises(GetLatestSyncTokenError) as e:
-        await client.get_latest_sync_token()
-    assert "Room Message Error" in str(e.value)
+async def test_get_latest_sync_token_message_error(sync_client):
+    sync_client.room_messages.return_value = RoomMessagesError("Room Message Error")
+    with pytest.raises(GetLatestSyncTokenError, match="Room Message Error"):
+        await sync_client.get_latest_sync_token()
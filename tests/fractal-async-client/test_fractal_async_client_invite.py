@@ -1,7 +1,9 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import logging
+import re
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-from fractal.matrix.async_client import FractalAsyncClient
+from conftest import areturn
 from fractal.matrix.exceptions import InvalidMatrixIdException
 from nio import (
     RoomGetStateEventError,
@@ -12,141 +14,123 @@ from nio import (
     RoomPutStateResponse,
 )
 
+# invite() writes the invited user into the power-levels content, so the
+# state response is built fresh per test; the invite/put responses are
+# read-only and shared.
+_INVITE_OK = RoomInviteResponse()
+_PUT_OK = RoomPutStateResponse(event_id="event_id", room_id="sample_id")
 
-async def test_invite_if_not_admin():
+
+def _power_levels_response(room_id, content=None):
+    return RoomGetStateEventResponse(
+        content=content if content is not None else {"users": {}},
+        event_type="event_id",
+        state_key="state_key",
+        room_id=room_id,
+    )
+
+
+async def test_invite_if_not_admin(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
-    client = FractalAsyncClient()
-    with pytest.raises(Exception) as e:
+    client = test_fractal_async_client
+    with pytest.raises(
+        Exception, match=re.escape("FIXME: Only admin invites are supported for now.")
+    ):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=False)
-    assert "FIXME: Only admin invites are supported for now." in str(e.value)
 
 
-async def test_invite_all_lower_case_failed():
+async def test_invite_all_lower_case_failed(test_fractal_async_client):
     sample_user_id = "@SaMplE_uSer:sample_domain"
     sample_room_id = "sample_id"
-    client = FractalAsyncClient()
-    with pytest.raises(Exception) as e:
+    client = test_fractal_async_client
+    with pytest.raises(Exception, match=re.escape("Matrix ids must be lowercase.")):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert "Matrix ids must be lowercase." in str(e.value)
 
 
-async def test_invite_send_invite():
+async def test_invite_send_invite(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
     sample_event_id = "event_id"
     sample_state_key = "state_key"
-    client = FractalAsyncClient()
-    client.room_invite = AsyncMock(return_value=RoomInviteResponse())
-    content = {"users": {}}
-    client.room_get_state_event = AsyncMock(
-        return_value=RoomGetStateEventResponse(
-            content=content,
-            event_type=sample_event_id,
-            state_key=sample_state_key,
-            room_id=sample_room_id,
-        )
-    )
-    client.room_put_state = AsyncMock(
-        return_value=RoomPutStateResponse(event_id=sample_event_id, room_id=sample_room_id)
-    )
-    with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
+    client = test_fractal_async_client
+    client.room_invite = areturn(_INVITE_OK)
+    client.room_get_state_event = areturn(_power_levels_response(sample_room_id))
+    client.room_put_state = areturn(_PUT_OK)
+    with patch("fractal.matrix.async_client.logger", new=Mock(spec_set=logging.Logger)) as mock_logger:
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
         mock_logger.info.assert_called_once_with(
             f"Sending invite to {sample_room_id} to user ({sample_user_id})"
         )
 
 
-async def test_invite_roominviteerror():
+async def test_invite_roominviteerror(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
-    client = FractalAsyncClient()
-    client.room_invite = AsyncMock(return_value=RoomInviteError("Room Invite Failed"))
-    with pytest.raises(Exception) as e:
+    client = test_fractal_async_client
+    client.room_invite = areturn(RoomInviteError("Room Invite Failed"))
+    with pytest.raises(Exception, match="Room Invite Failed"):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert "Room Invite Failed" in str(e.value)
 
 
-async def test_invite_raise_exception_for_userID():
+async def test_invite_raise_exception_for_userID(test_fractal_async_client):
     sample_user_id = "sample_user:sample_domain"
     sample_room_id = "sample_id"
-    client = FractalAsyncClient()
-    with pytest.raises(InvalidMatrixIdException) as e:
+    client = test_fractal_async_client
+    with pytest.raises(
+        InvalidMatrixIdException,
+        match=re.escape(f"{sample_user_id} is not a valid Matrix ID."),
+    ):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert f"{sample_user_id} is not a valid Matrix ID." in str(e.value)
 
 
-async def test_invite_get_power_levels():
+async def test_invite_get_power_levels(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
     sample_event_id = "event_id"
     sample_state_key = "state_key"
-    client = FractalAsyncClient()
-    client.room_invite = AsyncMock(return_value=RoomInviteResponse())
-    content = {"users": {}}
+    client = test_fractal_async_client
+    client.room_invite = areturn(_INVITE_OK)
     client.room_get_state_event = AsyncMock(
-        return_value=RoomGetStateEventResponse(
-            content=content,
-            event_type=sample_event_id,
-            state_key=sample_state_key,
-            room_id=sample_room_id,
-        )
-    )
-    client.room_put_state = AsyncMock(
-        return_value=RoomPutStateResponse(event_id=sample_event_id, room_id=sample_room_id)
+        return_value=_power_levels_response(sample_room_id)
     )
+    client.room_put_state = areturn(_PUT_OK)
     await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
     client.room_get_state_event.assert_called_once_with(sample_room_id, "m.room.power_levels")
 
 
-async def test_invite_room_get_state_event_error_when_has_message():
+async def test_invite_room_get_state_event_error_when_has_message(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
-    client = FractalAsyncClient()
+    client = test_fractal_async_client
     client.room_invite = AsyncMock()
-    client.room_get_state_event = AsyncMock(return_value=RoomGetStateEventError("Error message"))
-    with pytest.raises(Exception) as e:
+    client.room_get_state_event = areturn(RoomGetStateEventError("Error message"))
+    with pytest.raises(Exception, match="Error message"):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert "Error message" in str(e.value)
 
 
-async def test_invite_room_get_state_event_error_when_no_message():
+async def test_invite_room_get_state_event_error_when_no_message(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
     sample_event_id = "event_id"
     sample_state_key = "state_key"
-    client = FractalAsyncClient()
+    client = test_fractal_async_client
     client.room_invite = AsyncMock()
-    client.room_get_state_event = AsyncMock(
-        return_value=RoomGetStateEventResponse(
-            content={"errcode": "sample_error"},
-            event_type=sample_event_id,
-            state_key=sample_state_key,
-            room_id=sample_room_id,
-        )
+    client.room_get_state_event = areturn(
+        _power_levels_response(sample_room_id, content={"errcode": "sample_error"})
     )
-    with pytest.raises(Exception) as e:
+    with pytest.raises(Exception, match="error"):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert "error" in str(e.value)
 
 
-async def test_invite_room_put_state_error():
+async def test_invite_room_put_state_error(test_fractal_async_client):
     sample_user_id = "@sample_user:sample_domain"
     sample_room_id = "sample_id"
     sample_event_id = "event_id"
     sample_state_key = "state_key"
-    client = FractalAsyncClient()
-    client.room_invite = AsyncMock(return_value=RoomInviteResponse())
-    content = {"users": {}}
-    client.room_get_state_event = AsyncMock(
-        return_value=RoomGetStateEventResponse(
-            content=content,
-            event_type=sample_event_id,
-            state_key=sample_state_key,
-            room_id=sample_room_id,
-        )
-    )
-    client.room_put_state = AsyncMock(return_value=RoomPutStateError("Room Put State Error"))
-    with pytest.raises(Exception) as e:
+    client = test_fractal_async_client
+    client.room_invite = areturn(_INVITE_OK)
+    client.room_get_state_event = areturn(_power_levels_response(sample_room_id))
+    client.room_put_state = areturn(RoomPutStateError("Room Put State Error"))
+    with pytest.raises(Exception, match="Room Put State Error"):
         await client.invite(user_id=sample_user_id, room_id=sample_room_id, admin=True)
-    assert "Room Put State Error" in str(e.value)
@@ -1,20 +1,18 @@
-import asyncio
+import logging
 import os
-from builtins import super
-from copy import deepcopy
-from unittest.mock import AsyncMock, MagicMock, patch
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
-import aiohttp
 import pytest
-from aioresponses import aioresponses
+from conftest import areturn
 from fractal.matrix import MatrixClient, get_homeserver_for_matrix_id
-from fractal.matrix.async_client import FractalAsyncClient, parse_matrix_id
+from fractal.matrix.async_client import FractalAsyncClient
 from fractal.matrix.exceptions import (
     UnknownDiscoveryInfoException,
     WellKnownNotFoundException,
 )
 from nio import (
-    AsyncClient,
     DeviceList,
     DeviceOneTimeKeyCount,
     DiscoveryInfoError,
@@ -22,30 +20,92 @@ from nio import (
     InviteInfo,
     JoinError,
     JoinResponse,
-    PresenceEvent,
     RegisterResponse,
     RoomInfo,
     Rooms,
     SyncError,
     SyncResponse,
     Timeline,
-    TransferMonitor,
     UploadError,
     UploadResponse,
 )
-from nio.http import TransportResponse
 from nio.responses import RegisterErrorResponse
 
 
-async def test_decorator_async_context_manager_raises():
+def _transport_response(reason, ok=False):
+    # stands in for nio's TransportResponse; only the ok/reason
+    # attributes are read by get_homeserver_for_matrix_id, and a
+    # SimpleNamespace skips MagicMock's spec introspection entirely.
+    return SimpleNamespace(ok=ok, reason=reason)
+
+
+# pure-data sync fixtures shared across tests; nio constructors validate
+# fields on __init__, so build them once at module load.
+_DEVICE_LIST = DeviceList(changed=[], left=[])
+_DEVICE_KEY_COUNT = DeviceOneTimeKeyCount(curve25519=None, signed_curve25519=None)
+_SAMPLE_ROOMS = Rooms(
+    invite={"invite_room_id": InviteInfo(invite_state=[])},
+    join={
+        "join_room_id": RoomInfo(
+            timeline=Timeline(events=[], limited=True, prev_batch=""),
+            state=[],
+            ephemeral=[],
+            account_data=[],
+        )
+    },
+    leave={
+        "leave_room_id": RoomInfo(
+            timeline=Timeline(events=[], limited=True, prev_batch=""),
+            state=[],
+            ephemeral=[],
+            account_data=[],
+        )
+    },
+)
+# AsyncMock construction walks the class hierarchy to install awaitable
+# wrappers; share one mock for the homeserver lookup and reset per test.
+_GET_HS_MOCK = AsyncMock(return_value=("https://homeserver.org", False))
+
+
+@pytest.fixture
+def mock_get_homeserver():
+    _GET_HS_MOCK.reset_mock()
+    with patch(
+        "fractal.matrix.async_client.get_homeserver_for_matrix_id", new=_GET_HS_MOCK
+    ):
+        yield _GET_HS_MOCK
+
+
+_DISCOVERY_OK = DiscoveryInfoResponse(homeserver_url="http://localhost:8008")
+_REGISTER_OK = RegisterResponse(
+    user_id="sample_user", device_id="sample_device", access_token="expected_token"
+)
+_SAMPLE_SYNC_RESPONSE = SyncResponse(
+    next_batch="sample_batch_value",
+    rooms=_SAMPLE_ROOMS,
+    device_key_count=_DEVICE_KEY_COUNT,
+    device_list=_DEVICE_LIST,
+    to_device_events=[],
+    presence_events=[],
+)
+
+
+@pytest.fixture
+def no_homeserver_env(monkeypatch):
+    # hides MATRIX_HOMESERVER_URL from MatrixClient; returns the
+    # monkeypatch so tests can drop further variables.
+    monkeypatch.delenv("MATRIX_HOMESERVER_URL", raising=False)
+    return monkeypatch
+
+
+async def test_decorator_async_context_manager_raises(no_homeserver_env):
     """
     Ensure
     """
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(KeyError) as e:
-            async with MatrixClient() as client:
-                pass
-        assert "MATRIX_HOMESERVER_URL" in str(e.value)
+    no_homeserver_env.delenv("MATRIX_ID", raising=False)
+    with pytest.raises(KeyError, match="MATRIX_HOMESERVER_URL"):
+        async with MatrixClient() as client:
+            pass
 
 
 @patch("fractal.matrix.async_client.AsyncClientConfig")
@@ -67,132 +127,100 @@ async def test_decorator_async_context_manager(AsyncClientConfigMock):
     AsyncClientConfigMock.assert_called_with(max_timeouts=max_timeouts, request_timeout=5)
 
 
-async def test_decorator_async_decorator():
+@patch("fractal.matrix.async_client.FractalAsyncClient")
+async def test_decorator_async_decorator(FractalAsyncClientMock):
     """
-    Ensure the decorator passes an instance of AsyncClient as the last argument
+    Ensure the decorator passes the constructed client as the last argument
     """
+    # MatrixClient() reads MATRIX_* env vars at construction time, so the
+    # decorated probe stays test-scoped rather than hoisted to a shared
+    # fixture.
+    client_instance = FractalAsyncClientMock.return_value
+    client_instance.close = AsyncMock()
 
     @MatrixClient()
     async def test(foo, bar, client):
-        assert isinstance(client, AsyncClient)
+        assert client is client_instance
 
     await test("foo", "bar")  # type: ignore
+    client_instance.close.assert_awaited()
 
 
-async def test_decorator_async_decorator_no_home_server_and_no_matrix_id_raises_error():
-    environment = deepcopy(os.environ)
-    environment.pop("MATRIX_HOMESERVER_URL", None)
-    environment.pop("MATRIX_ID", None)
-    with patch.dict(os.environ, environment, clear=True):
-        with pytest.raises(KeyError) as e:
-            async with MatrixClient() as client:
-                assert client.homeserver == None
+async def test_decorator_async_decorator_no_home_server_and_no_matrix_id_raises_error(
+    no_homeserver_env,
+):
+    no_homeserver_env.delenv("MATRIX_ID", raising=False)
+    with pytest.raises(KeyError) as e:
+        async with MatrixClient() as client:
+            assert client.homeserver == None
 
 
-async def test_context_manager_no_home_server():
-    environment = deepcopy(os.environ)
-    environment.pop("MATRIX_HOMESERVER_URL", None)
+async def test_context_manager_no_home_server(no_homeserver_env, mock_get_homeserver):
     matrix_id = "@user:homeserver.org"
-    with patch.dict(os.environ, environment, clear=True):
-        with patch(
-            "fractal.matrix.async_client.get_homeserver_for_matrix_id",
-            new=AsyncMock(return_value=("https://homeserver.org", False)),
-        ) as mock_get_homeserver:
-            async with MatrixClient(matrix_id=matrix_id) as client:
-                assert client.homeserver == "https://homeserver.org"
-
-
-async def test_context_manager_no_access_token():
-    environment = deepcopy(os.environ)
-    environment.pop("MATRIX_HOMESERVER_URL", None)
-    environment.pop("MATRIX_ACCESS_TOKEN")
-    matrix_id = "@user:homeserver.org"
-    with patch.dict(os.environ, environment, clear=True):
-        with patch(
-            "fractal.matrix.async_client.get_homeserver_for_matrix_id",
-            new=AsyncMock(return_value=("https://homeserver.org", False)),
-        ) as mock_get_homeserver:
-            async with MatrixClient(matrix_id=matrix_id) as client:
-                assert client.access_token == None
-                assert client.user == matrix_id
-
-
-async def test_context_manager_testing_access_token():
-    environment = deepcopy(os.environ)
-    environment.pop("MATRIX_HOMESERVER_URL", None)
-    environment.pop("MATRIX_ACCESS_TOKEN")
-    matrix_id = "@user:homeserver.org"
-    with patch.dict(os.environ, environment, clear=True):
-        with patch(
-            "fractal.matrix.async_client.get_homeserver_for_matrix_id",
-            new=AsyncMock(return_value=("https://homeserver.org", False)),
-        ) as mock_get_homeserver:
-            async with MatrixClient(matrix_id=matrix_id, access_token="test_token") as client:
-                assert client.user == ""
+    async with MatrixClient(matrix_id=matrix_id) as client:
+        assert client.homeserver == "https://homeserver.org"
 
 
-@patch("fractal.matrix.async_client.FractalAsyncClient")
-async def test_get_matrix_homeserver_url_for_matrix_id(AsyncClientMock):
-    client_instance = AsyncClientMock.return_value
-    client_instance.close = AsyncMock()
-    response = DiscoveryInfoResponse(homeserver_url="http://localhost:8008")
-    client_instance.discovery_info = AsyncMock(return_value=response)
+async def test_context_manager_no_access_token(no_homeserver_env, mock_get_homeserver):
+    no_homeserver_env.delenv("MATRIX_ACCESS_TOKEN")
+    matrix_id = "@user:homeserver.org"
+    async with MatrixClient(matrix_id=matrix_id) as client:
+        assert client.access_token == None
+        assert client.user == matrix_id
 
-    homeserver_url, apex_changed = await get_homeserver_for_matrix_id("@user:localhost")
-    assert homeserver_url == "http://localhost:8008"
 
+async def test_context_manager_testing_access_token(no_homeserver_env, mock_get_homeserver):
+    no_homeserver_env.delenv("MATRIX_ACCESS_TOKEN")
+    matrix_id = "@user:homeserver.org"
+    async with MatrixClient(matrix_id=matrix_id, access_token="test_token") as client:
+        assert client.user == ""
 
-@patch("fractal.matrix.async_client.FractalAsyncClient")
-async def test_get_matrix_homeserver_url_for_matrix_id_not_found(AsyncClientMock):
+
+@pytest.fixture
+def fractal_async_client_mock(mocker):
+    # pre-wired mock client shared by the homeserver discovery tests;
+    # function-scoped because each test rewires discovery_info.
+    AsyncClientMock = mocker.patch("fractal.matrix.async_client.FractalAsyncClient")
     client_instance = AsyncClientMock.return_value
     client_instance.close = AsyncMock()
-    homeserver_url = "https://matrix-client.matrix.org"
-    discovery_info_response = DiscoveryInfoError(message="Test")
-    discovery_info_response.transport_response = MagicMock(spec=TransportResponse)
-    discovery_info_response.transport_response.ok = False
-    discovery_info_response.transport_response.reason = "Not Found"
-    response = AsyncMock(return_value=discovery_info_response)
-    client_instance.discovery_info = response
+    return client_instance
 
-    with pytest.raises(WellKnownNotFoundException) as e:
-        await get_homeserver_for_matrix_id("@user:matrix.org")
-    assert ".well-known" in str(e.value)
-    client_instance.discovery_info.assert_awaited()
 
+async def test_get_matrix_homeserver_url_for_matrix_id(fractal_async_client_mock):
+    fractal_async_client_mock.discovery_info = areturn(_DISCOVERY_OK)
 
-@patch("fractal.matrix.async_client.FractalAsyncClient")
-async def test_get_matrix_homeserver_url_for_matrix_id_unknown_error(AsyncClientMock):
-    client_instance = AsyncClientMock.return_value
-    client_instance.close = AsyncMock()
-    homeserver_url = "https://matrix-client.matrix.org"
-    discovery_info_response = DiscoveryInfoError(message="Test")
-    discovery_info_response.transport_response = MagicMock(spec=TransportResponse)
-    discovery_info_response.transport_response.ok = False
-    discovery_info_response.transport_response.reason = "Error"
-    response = AsyncMock(return_value=discovery_info_response)
-    client_instance.discovery_info = response
-
-    with pytest.raises(UnknownDiscoveryInfoException) as e:
-        await get_homeserver_for_matrix_id("@user:matrix.org")
-    assert "Error" in str(e.value)
-    client_instance.discovery_info.assert_awaited()
+    homeserver_url, apex_changed = await get_homeserver_for_matrix_id("@user:localhost")
+    assert homeserver_url == "http://localhost:8008"
 
 
-@patch("fractal.matrix.async_client.FractalAsyncClient")
-async def test_get_matrix_homeserver_url_for_matrix_id_url_apex_changed(AsyncClientMock):
-    client_instance = AsyncClientMock.return_value
-    client_instance.close = AsyncMock()
-    homeserver_url = "https://matrix-client.test.com"
-    discovery_info_response = DiscoveryInfoResponse(homeserver_url)
-    discovery_info_response.transport_response = MagicMock(spec=TransportResponse)
-    discovery_info_response.transport_response.ok = False
-    discovery_info_response.transport_response.reason = "Error"
-    response = AsyncMock(return_value=discovery_info_response)
-    client_instance.discovery_info = response
-    server, apexchanged = await get_homeserver_for_matrix_id("@user:matrix.org")
-    assert server == homeserver_url
-    assert apexchanged == True
-    client_instance.discovery_info.assert_awaited()
+@pytest.mark.parametrize(
+    "homeserver_url,reason,resp_cls,exc,substr",
+    [
+        ("https://matrix-client.matrix.org", "Not Found", DiscoveryInfoError, WellKnownNotFoundException, ".well-known"),
+        ("https://matrix-client.matrix.org", "Error", DiscoveryInfoError, UnknownDiscoveryInfoException, "Error"),
+        ("https://matrix-client.test.com", "Error", DiscoveryInfoResponse, None, None),
+    ],
+)
+async def test_get_matrix_homeserver_url_for_matrix_id_discovery_outcomes(
+    homeserver_url, reason, resp_cls, exc, substr, fractal_async_client_mock
+):
+    if resp_cls is DiscoveryInfoError:
+        discovery_info_response = resp_cls(message="Test")
+        # only the error paths read transport_response
+        discovery_info_response.transport_response = _transport_response(reason)
+    else:
+        discovery_info_response = resp_cls(homeserver_url)
+    fractal_async_client_mock.discovery_info = AsyncMock(return_value=discovery_info_response)
+
+    if exc is None:
+        # well-known lookup succeeded but points at a different apex
+        server, apex_changed = await get_homeserver_for_matrix_id("@user:matrix.org")
+        assert server == homeserver_url
+        assert apex_changed == True
+    else:
+        with pytest.raises(exc, match=re.escape(substr)):
+            await get_homeserver_for_matrix_id("@user:matrix.org")
+    fractal_async_client_mock.discovery_info.assert_awaited()
 
 
 async def test_register_with_token_works():
@@ -202,71 +230,37 @@ async def test_register_with_token_works():
     matrix_id = "@user:localhost"
     password = "pass"
     registration_token = "test_reg"
-    register_with_token_response = RegisterResponse(matrix_id, "devid", access_token)
-    client.register_with_token = AsyncMock(return_value=register_with_token_response)
+    client.register_with_token = areturn(_REGISTER_OK)
     token = await client.register_with_token(matrix_id, password, registration_token)
+    assert token is _REGISTER_OK
 
 
-async def test_get_room_invites_sync_error():
-    client = FractalAsyncClient()
-    with patch.object(
-        client, "sync", new=AsyncMock(return_value=SyncError("Error with request"))
-    ):
-        with pytest.raises(Exception) as e:
+async def test_get_room_invites_sync_error(test_fractal_async_client):
+    client = test_fractal_async_client
+    with patch.object(client, "sync", new=areturn(SyncError("Error with request"))):
+        with pytest.raises(Exception, match="Error with request"):
             await client.get_room_invites()
-        assert "Error with request" in str(e.value)
-
-
-async def test_get_room_invites_return_inviteinfo():
-    client = FractalAsyncClient()
-    sample_next_batch = "sample_batch_value"
-    rooms = Rooms(
-        invite={"invite_room_id": InviteInfo(invite_state=[])},
-        join={
-            "join_room_id": RoomInfo(
-                timeline=Timeline(events=[], limited=True, prev_batch=""),
-                state=[],
-                ephemeral=[],
-                account_data=[],
-            )
-        },
-        leave={
-            "leave_room_id": RoomInfo(
-                timeline=Timeline(events=[], limited=True, prev_batch=""),
-                state=[],
-                ephemeral=[],
-                account_data=[],
-            )
-        },
-    )
-    devicelist = DeviceList(changed=[], left=[])
-    devicecount = DeviceOneTimeKeyCount(curve25519=None, signed_curve25519=None)
-    client.sync = AsyncMock(
-        return_value=SyncResponse(
-            next_batch=sample_next_batch,
-            rooms=rooms,
-            device_key_count=devicecount,
-            device_list=devicelist,
-            to_device_events=[],
-            presence_events=[],
-        )
-    )
+
+
+async def test_get_room_invites_return_inviteinfo(test_fractal_async_client):
+    client = test_fractal_async_client
+    client.sync = areturn(_SAMPLE_SYNC_RESPONSE)
     result = await client.get_room_invites()
     expected_invite_info = {"invite_room_id": InviteInfo(invite_state=[])}
     assert result == expected_invite_info
 
 
-async def test_join_room_logger():
-    client = FractalAsyncClient()
+async def test_join_room_logger(test_fractal_async_client):
+    client = test_fractal_async_client
     client.join = AsyncMock()
     room_id = "sample_room_id"
-    with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
+    with patch("fractal.matrix.async_client.logger", new=Mock(spec_set=logging.Logger)) as mock_logger:
         await client.join_room(room_id=room_id)
         mock_logger.info.assert_called_once_with(f"Joining room: {room_id}")
 
 
-async def test_join_room_join_response():
-    client = FractalAsyncClient()
+async def test_join_room_join_response(test_fractal_async_client):
+    client = test_fractal_async_client
     room_id = "sample_room_id"
     join_response = JoinResponse(room_id=room_id)
     client.join = AsyncMock(return_value=join_response)
@@ -275,222 +269,203 @@ async def test_join_room_join_response():
     assert await client.join_room(room_id=room_id) is None
 
 
-async def test_join_room_join_error():
-    client = FractalAsyncClient()
+async def test_join_room_join_error(test_fractal_async_client):
+    client = test_fractal_async_client
     client.join = AsyncMock(return_value=JoinError("Failed to join room"))
     room_id = "sample_room_id"
-    with pytest.raises(Exception) as e:
+    with pytest.raises(Exception, match="Failed to join room"):
         await client.join_room(room_id=room_id)
-    assert "Failed to join room" in str(e.value)
 
 
-async def test_disable_ratelimiting_post_mock_correct(mock_aiohttp_client):
-    client = FractalAsyncClient()
+async def test_disable_ratelimiting_post_mock_correct(test_fractal_async_client):
+    client = test_fractal_async_client
     matrix_id = "sample_matrix_id"
     request_url = f"{client.homeserver}/_synapse/admin/v1/users/{matrix_id}/override_ratelimit"
-    mock_aiohttp_client.post(request_url, status=200)
-    await client.disable_ratelimiting(matrix_id=matrix_id)
-    mock_aiohttp_client.assert_called_with(
-        request_url,
-        method="POST",
-        headers={"Authorization": f"Bearer {client.access_token}"},
-        json={},
-    )
+    response = MagicMock(ok=True)
+    with patch.object(
+        FractalAsyncClient, "_admin_request", new=AsyncMock(return_value=response)
+    ) as mock_request:
+        await client.disable_ratelimiting(matrix_id=matrix_id)
+    mock_request.assert_called_with("POST", request_url, {})
 
 
-async def test_disable_ratelimiting_override_error(mock_aiohttp_client):
-    client = FractalAsyncClient()
+async def test_disable_ratelimiting_override_error(test_fractal_async_client):
+    client = test_fractal_async_client
     matrix_id = "sample_matrix_id"
-    request_url = f"{client.homeserver}/_synapse/admin/v1/users/{matrix_id}/override_ratelimit"
     status = 500
-    mock_aiohttp_client.post(request_url, status=status)
-    with pytest.raises(Exception) as e:
-        await client.disable_ratelimiting(matrix_id=matrix_id)
-    assert f"Failed to override rate limit. Error Response status {status}: " in str(e.value)
+    response = MagicMock(ok=False, status=status)
+    response.text = AsyncMock(return_value="")
+    with patch.object(
+        FractalAsyncClient, "_admin_request", new=AsyncMock(return_value=response)
+    ):
+        with pytest.raises(
+            Exception,
+            match=re.escape(f"Failed to override rate limit. Error Response status {status}: "),
+        ):
+            await client.disable_ratelimiting(matrix_id=matrix_id)
 
 
-async def test_disable_ratelimiting_logger(mock_aiohttp_client):
-    client = FractalAsyncClient()
+async def test_disable_ratelimiting_logger(test_fractal_async_client):
+    client = test_fractal_async_client
     matrix_id = "sample_matrix_id"
     request_url = f"{client.homeserver}/_synapse/admin/v1/users/{matrix_id}/override_ratelimit"
-    mock_aiohttp_client.post(request_url, status=200)
-    with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
-        await client.disable_ratelimiting(matrix_id=matrix_id)
-        mock_logger.info.assert_called_with("Rate limit override successful.")
-    mock_aiohttp_client.assert_called_with(
-        request_url,
-        method="POST",
-        headers={"Authorization": f"Bearer {client.access_token}"},
-        json={},
-    )
+    response = MagicMock(ok=True)
+    with patch.object(
+        FractalAsyncClient, "_admin_request", new=AsyncMock(return_value=response)
+    ) as mock_request:
+        with patch("fractal.matrix.async_client.logger", new=Mock(spec_set=logging.Logger)) as mock_logger:
+            await client.disable_ratelimiting(matrix_id=matrix_id)
+            mock_logger.info.assert_called_with("Rate limit override successful.")
+    mock_request.assert_called_with("POST", request_url, {})
 
 
-async def test_generate_registration_token_post_mock(mock_aiohttp_client):
-    client = FractalAsyncClient()
+async def test_generate_registration_token_post_mock(test_fractal_async_client):
+    client = test_fractal_async_client
     request_url = f"{client.homeserver}/_synapse/admin/v1/registration_tokens/new"
     token_value = "sample_token"
-    expected_payload = {"token": token_value}
-    mock_aiohttp_client.post(request_url, status=200, payload=expected_payload)
-    token = await client.generate_registration_token()
-    assert isinstance(token, str)
-    mock_aiohttp_client.assert_called_once_with(
-        request_url,
-        method="POST",
-        headers={"Authorization": f"Bearer {client.access_token}"},
-        json={},
-    )
+    response = MagicMock(ok=True)
+    response.json = AsyncMock(return_value={"token": token_value})
+    with patch.object(
+        FractalAsyncClient, "_admin_request", new=AsyncMock(return_value=response)
+    ) as mock_request:
+        token = await client.generate_registration_token()
+    assert token == token_value
+    mock_request.assert_called_once_with("POST", request_url, {"uses_allowed": None})
 
 
-async def test_generate_registration_token_override_error(mock_aiohttp_client):
-    client = FractalAsyncClient()
-    request_url = f"{client.homeserver}/_synapse/admin/v1/registration_tokens/new"
+async def test_generate_registration_token_override_error(test_fractal_async_client):
+    client = test_fractal_async_client
     status = 500
-    mock_aiohttp_client.post(request_url, status=status)
-    with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
-        with pytest.raises(Exception):
-            await client.generate_registration_token()
-        mock_logger.error.assert_called_with(
-            f"Failed to override rate limit. Error Response status {status}: "
-        )
+    response = MagicMock(ok=False, status=status)
+    response.text = AsyncMock(return_value="")
+    with patch.object(
+        FractalAsyncClient, "_admin_request", new=AsyncMock(return_value=response)
+    ):
+        with patch("fractal.matrix.async_client.logger", new=Mock(spec_set=logging.Logger)) as mock_logger:
+            with pytest.raises(Exception):
+                await client.generate_registration_token()
+            mock_logger.error.assert_called_with(
+                f"Failed to create registration token. Error Response status {status}: "
+            )
 
 
-async def test_register_with_token_username_created_and_parent_register_with_token_called():
-    client = FractalAsyncClient()
-    matrix_id = "sample_matrix_id"
-    password = "sample_password"
-    registration_token = "sample_registration_token"
-    with patch(
-        "fractal.matrix.async_client.parse_matrix_id",
-        new=MagicMock(return_value=["sample_username"]),
-    ) as mock_parse:
-        with patch(
+@pytest.fixture
+def register_mocks(test_fractal_async_client):
+    # shared patch scaffolding for the register_with_token tests; yields
+    # the client (with disable_ratelimiting already mocked) and the
+    # parse/parent-register mocks.
+    client = test_fractal_async_client
+    with (
+        patch(
+            "fractal.matrix.async_client.parse_matrix_id",
+            new=MagicMock(return_value=["sample_username"]),
+        ) as mock_parse,
+        patch(
             "fractal.matrix.async_client.AsyncClient.register_with_token", new=AsyncMock()
-        ) as mock_register_with_token:
-            client.disable_ratelimiting = AsyncMock()
-            await client.register_with_token(
-                matrix_id=matrix_id,
-                password=password,
-                registration_token=registration_token,
-            )
-            mock_register_with_token.assert_called_once_with(
-                "sample_username", password, registration_token, device_name=""
-            )
+        ) as mock_register_with_token,
+    ):
+        client.disable_ratelimiting = AsyncMock()
+        yield client, mock_parse, mock_register_with_token
 
 
-async def test_register_with_token_registererrorresponse():
-    client = FractalAsyncClient()
-    matrix_id = "sample_matrix_id"
-    password = "sample_password"
-    registration_token = "sample_registration_token"
-    with patch("fractal.matrix.async_client.parse_matrix_id", new=MagicMock()) as mock_parse:
-        with patch(
-            "fractal.matrix.async_client.AsyncClient.register_with_token",
-            new=AsyncMock(return_value=RegisterErrorResponse("Error with response")),
-        ) as mock_register_with_token:
-            with pytest.raises(Exception) as e:
-                await client.register_with_token(
-                    matrix_id=matrix_id,
-                    password=password,
-                    registration_token=registration_token,
-                    disable_ratelimiting=True,
-                )
-            assert "Error with response" in str(e)
-
-
-async def test_register_with_token_disable_ratelimiting_for_user():
-    client = FractalAsyncClient()
-    matrix_id = "sample_matrix_id"
+async def test_register_with_token_username_created_and_parent_register_with_token_called(
+    register_mocks,
+):
+    client, mock_parse, mock_register_with_token = register_mocks
     password = "sample_password"
     registration_token = "sample_registration_token"
-    with patch("fractal.matrix.async_client.parse_matrix_id", new=MagicMock()) as mock_parse:
-        with patch(
-            "fractal.matrix.async_client.AsyncClient.register_with_token", new=AsyncMock()
-        ) as mock_register_with_token:
-            client.disable_ratelimiting = AsyncMock()
-            await client.register_with_token(
-                matrix_id=matrix_id,
-                password=password,
-                registration_token=registration_token,
-            )
-            client.disable_ratelimiting.assert_called_once_with(matrix_id)
+    await client.register_with_token(
+        matrix_id="sample_matrix_id",
+        password=password,
+        registration_token=registration_token,
+    )
+    mock_register_with_token.assert_called_once_with(
+        "sample_username", password, registration_token, device_name=""
+    )
 
 
-async def test_register_with_token_successful_registration_access_token():
-    client = FractalAsyncClient()
+async def test_register_with_token_registererrorresponse(register_mocks):
+    client, mock_parse, mock_register_with_token = register_mocks
+    mock_register_with_token.return_value = RegisterErrorResponse("Error with response")
+    with pytest.raises(Exception, match="Error with response"):
+        await client.register_with_token(
+            matrix_id="sample_matrix_id",
+            password="sample_password",
+            registration_token="sample_registration_token",
+            disable_ratelimiting=True,
+        )
+
+
+async def test_register_with_token_disable_ratelimiting_for_user(register_mocks):
+    client, mock_parse, mock_register_with_token = register_mocks
     matrix_id = "sample_matrix_id"
-    password = "sample_password"
-    registration_token = "sample_registration_token"
-    expected_access_token = "expected_token"
-    with patch("fractal.matrix.async_client.parse_matrix_id", new=MagicMock()) as mock_parse:
-        with patch(
-            "fractal.matrix.async_client.AsyncClient.register_with_token", new=AsyncMock()
-        ) as mock_register_with_token:
-            mock_register_with_token.return_value = RegisterResponse(
-                user_id="sample_user",
-                device_id="sample_device",
-                access_token=expected_access_token,
-            )
-            client.disable_ratelimiting = AsyncMock()
-            access_token = await client.register_with_token(
-                matrix_id=matrix_id,
-                password=password,
-                registration_token=registration_token,
-            )
-            assert access_token == expected_access_token
+    await client.register_with_token(
+        matrix_id=matrix_id,
+        password="sample_password",
+        registration_token="sample_registration_token",
+    )
+    client.disable_ratelimiting.assert_called_once_with(matrix_id)
+
 
+async def test_register_with_token_successful_registration_access_token(register_mocks):
+    client, mock_parse, mock_register_with_token = register_mocks
+    mock_register_with_token.return_value = _REGISTER_OK
+    access_token = await client.register_with_token(
+        matrix_id="sample_matrix_id",
+        password="sample_password",
+        registration_token="sample_registration_token",
+    )
+    assert access_token == _REGISTER_OK.access_token
 
-async def test_upload_file_success_no_monitor(mock_async_context_manager):
-    client = FractalAsyncClient()
+
+@pytest.fixture
+def upload_mocks(mock_async_context_manager):
+    # single patch stack shared by the upload_file tests; yields the
+    # logger mock, the only one the tests assert on.
+    with (
+        patch("fractal.matrix.async_client.aiofiles_os.stat", new=AsyncMock()),
+        patch(
+            "fractal.matrix.async_client.aiofiles_open",
+            new=MagicMock(spec=mock_async_context_manager),
+        ),
+        patch("fractal.matrix.async_client.logger", new=Mock(spec_set=logging.Logger)) as mock_logger,
+    ):
+        yield mock_logger
+
+
+async def test_upload_file_success_no_monitor(upload_mocks, test_fractal_async_client):
+    client = test_fractal_async_client
     success = (UploadResponse("http://Someurl"), {})
     client.upload = AsyncMock(return_value=success)
     file_path = "sample/file/path"
-    # create mock to use fake file path for
-    with patch("fractal.matrix.async_client.aiofiles_os.stat", new=AsyncMock()) as mock_file_stat:
-        with patch(
-            "fractal.matrix.async_client.aiofiles_open",
-            new=MagicMock(spec=mock_async_context_manager),
-        ) as mock_file_open:
-            with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
-                content_uri = await client.upload_file(file_path=file_path)
-                assert content_uri == "http://Someurl"
-                mock_logger.info.assert_called_once_with(f"Uploading file: {file_path}")
-                client.upload.assert_called()
-                assert "monitor" not in client.upload.call_args.kwargs
+    content_uri = await client.upload_file(file_path=file_path)
+    assert content_uri == "http://Someurl"
+    upload_mocks.info.assert_called_once_with(f"Uploading file: {file_path}")
+    client.upload.assert_called()
+    assert "monitor" not in client.upload.call_args.kwargs
 
 
-async def test_upload_file_uploaderror(mock_async_context_manager):
-    client = FractalAsyncClient()
+async def test_upload_file_uploaderror(upload_mocks, test_fractal_async_client):
+    client = test_fractal_async_client
     failure = (UploadError("Failed to upload file."), {})
     client.upload = AsyncMock(return_value=failure)
     file_path = "sample/file/path"
-    # create mock to use fake file path for
-    with patch("fractal.matrix.async_client.aiofiles_os.stat", new=AsyncMock()) as mock_file_stat:
-        with patch(
-            "fractal.matrix.async_client.aiofiles_open",
-            new=MagicMock(spec=mock_async_context_manager),
-        ) as mock_file_open:
-            with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
-                with pytest.raises(Exception) as e:
-                    await client.upload_file(file_path=file_path)
-                assert "Failed to upload file." in str(e.value)
+    with pytest.raises(Exception, match=re.escape("Failed to upload file.")):
+        await client.upload_file(file_path=file_path)
 
 
-async def test_upload_file_monitor_success(mock_async_context_manager):
-    client = FractalAsyncClient()
+async def test_upload_file_monitor_success(upload_mocks, test_fractal_async_client):
+    client = test_fractal_async_client
     success = (UploadResponse("http://Someurl"), {})
     client.upload = AsyncMock(return_value=success)
     file_path = "sample/file/path"
-    # create mock to use fake file path for
-    with patch("fractal.matrix.async_client.aiofiles_os.stat", new=AsyncMock()) as mock_file_stat:
-        with patch(
-            "fractal.matrix.async_client.aiofiles_open",
-            new=MagicMock(spec=mock_async_context_manager),
-        ) as mock_file_open:
-            with patch("fractal.matrix.async_client.logger", new=MagicMock()) as mock_logger:
-                trans_monitor = TransferMonitor(total_size=10)
-                content_uri = await client.upload_file(file_path=file_path, monitor=trans_monitor)
-                assert content_uri == "http://Someurl"
-                mock_logger.info.assert_called_once_with(f"Uploading file: {file_path}")
-                assert "http://Someurl" in content_uri
-                client.upload.assert_called()
-                assert client.upload.call_args.kwargs["monitor"].total_size == 10
+    # a real TransferMonitor starts a background thread on construction;
+    # the test only checks the object is forwarded to upload.
+    trans_monitor = MagicMock()
+    trans_monitor.total_size = 10
+    content_uri = await client.upload_file(file_path=file_path, monitor=trans_monitor)
+    assert content_uri == "http://Someurl"
+    upload_mocks.info.assert_called_once_with(f"Uploading file: {file_path}")
+    assert "http://Someurl" in content_uri
+    client.upload.assert_called()
+    assert client.upload.call_args.kwargs["monitor"].total_size == 10